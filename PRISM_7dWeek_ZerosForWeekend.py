@@ -6,19 +6,49 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from scipy.signal import firwin, filtfilt, find_peaks
+from prism_loader import load_series
+from prism_lean import LeanBuffers, lean_spectrum, track_peak, format_bytes
+from prism_zoom import (parse_band, parse_periods, plot_zoom_bands,
+                        print_target_periods)
+
+# now mark known calendar-day cycles
+KNOWN_PERIODS = {
+    "Weekly":    7,
+    "Monthly":  30,
+    "Quarter":  91,
+    "Semiannual": 182,
+    "Yearly":   365,
+    "Biennial": 730
+}
 
 
 def parse_args():
     parser = argparse.ArgumentParser(description="FFT volume analyzer")
     parser.add_argument("--ticker", default="AMZN",
                         help="Ticker symbol to fetch (e.g. AMZN)")
+    parser.add_argument("--data", metavar="DIR",
+                        help="read daily volume from a local CSV tree "
+                             "(e.g. data) instead of downloading")
+    parser.add_argument("--lean", action="store_true",
+                        help="float32 / rfft / reused-buffer spectrum pipeline")
+    parser.add_argument("--zoom", action="append", type=parse_band,
+                        metavar="MIN:MAX",
+                        help="chirp-z zoom spectrum over a period band "
+                             "(repeatable, e.g. --zoom 40:50)")
+    parser.add_argument("--periods", type=parse_periods, metavar="P1,P2,...",
+                        help="Goertzel amplitude at exact periods "
+                             "(e.g. --periods 44,45.6,46)")
     return parser.parse_args()
 
 
-def fetch_volume(ticker: str, start: str, end: str) -> pd.Series:
-    df = yf.download(ticker, start=start, end=end,
-                     progress=False, auto_adjust=False)
-    vol = df["Volume"].dropna().sort_index()
+def fetch_volume(ticker: str, start: str, end: str,
+                 data_dir: str = None) -> pd.Series:
+    if data_dir:
+        vol = load_series(data_dir, ticker, "daily", start, end)
+    else:
+        df = yf.download(ticker, start=start, end=end,
+                         progress=False, auto_adjust=False)
+        vol = df["Volume"].dropna().sort_index()
     vol.index = pd.to_datetime(vol.index)
     # reindex to every calendar day, fill non-trading days with 0
     return vol.asfreq("D").fillna(0)
@@ -48,19 +78,18 @@ def low_pass_filter(data, cutoff, fs=1.0, requested_taps=101):
     return filtered_padded[padlen:-padlen]
 
 
-def plot_fft(vol_series: pd.Series,
-             title: str,
+_lean_buffers = LeanBuffers()
+
+
+def spectrum(vol_series: pd.Series,
              max_period_days: float,
-             cutoff_freq: float) -> None:
-    # helper: greedy select peaks ensuring min distance in days
-    def greedy_select(peaks, power, periods, count, min_sep=1.1):
-        selected = []
-        for p in peaks:
-            if len(selected) >= count:
-                break
-            if all(abs(periods[p] - periods[q]) > min_sep for q in selected):
-                selected.append(p)
-        return selected
+             cutoff_freq: float,
+             lean: bool = False):
+    if lean:
+        # views into _lean_buffers: valid until the next spectrum(lean=True)
+        return lean_spectrum(vol_series.to_numpy(), cutoff_freq,
+                             max_period_days, 3 * 365,
+                             buffers=_lean_buffers)
 
     vals = vol_series.values.astype(float)
     centered = vals - vals.mean()
@@ -93,6 +122,33 @@ def plot_fft(vol_series: pd.Series,
     power_plot = power_plot[keep]
     period_plot = period_plot[keep]
 
+    return freq_plot, power_plot, period_plot
+
+
+def plot_fft(vol_series: pd.Series,
+             title: str,
+             max_period_days: float,
+             cutoff_freq: float,
+             lean: bool = False) -> None:
+    # helper: greedy select peaks ensuring min distance in days
+    def greedy_select(peaks, power, periods, count, min_sep=1.1):
+        selected = []
+        for p in peaks:
+            if len(selected) >= count:
+                break
+            if all(abs(periods[p] - periods[q]) > min_sep for q in selected):
+                selected.append(p)
+        return selected
+
+    (freq_plot, power_plot, period_plot), peak = track_peak(
+        spectrum, vol_series, max_period_days, cutoff_freq, lean=lean)
+    # the reused lean buffers are only allocated (and counted) on the first
+    # call, so report what they hold alongside the per-call peak
+    extra = (f", reused buffers {format_bytes(_lean_buffers.nbytes())}"
+             if lean else "")
+    print(f"Spectrum peak memory ({'lean' if lean else 'default'}): "
+          f"{format_bytes(peak)}{extra}")
+
     plt.figure(figsize=(12,6))
     plt.plot(freq_plot, power_plot, lw=1)
 
@@ -133,17 +189,8 @@ def plot_fft(vol_series: pd.Series,
     plt.ylabel("Amplitude")
     plt.grid(alpha=0.3, which="both", linestyle="--")
 
-    # now mark known calendar-day cycles
-    known_periods = {
-        "Weekly":    7,
-        "Monthly":  30,
-        "Quarter":  91,
-        "Semiannual": 182,
-        "Yearly":   365,
-        "Biennial": 730
-    }
     ax = plt.gca()
-    for label, days in known_periods.items():
+    for label, days in KNOWN_PERIODS.items():
         f = 1 / days
         ax.axvline(f, color='gray', linestyle='--', alpha=0.6, lw=1)
         ax.text(f, 0.95, label,
@@ -160,7 +207,7 @@ def main():
     ticker = args.ticker.upper()
     start_date, end_date = "2014-01-01", "2024-12-31"
 
-    volume = fetch_volume(ticker, start_date, end_date)
+    volume = fetch_volume(ticker, start_date, end_date, data_dir=args.data)
     print(f"N = {len(volume)} samples for {ticker} "
           f"from {volume.index.min()} to {volume.index.max()}")
 
@@ -168,7 +215,18 @@ def main():
     plot_fft(volume,
              title=f"{ticker} Daily Volume FFT (2014–2024)",
              max_period_days=3650,
-             cutoff_freq=cutoff)
+             cutoff_freq=cutoff,
+             lean=args.lean)
+
+    if args.zoom or args.periods:
+        vals = volume.values.astype(float)
+        filt = low_pass_filter(vals - vals.mean(), cutoff=cutoff)
+        if args.periods:
+            print_target_periods(filt, args.periods)
+        if args.zoom:
+            plot_zoom_bands(filt, args.zoom,
+                            known_periods=KNOWN_PERIODS)
+            plt.show()
 
 
 if __name__ == "__main__":
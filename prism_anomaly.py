@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+
+# Streaming anomaly detector on the cycle-model residual.
+#
+#   python prism_anomaly.py --tickers AMZN AAPL MSFT --train-end 2020-01-01
+#
+# Fit: on a training span, the dominant cycles of every ticker are picked
+# exactly as prism_channels does it (filtered spectrum + greedy top peaks),
+# refined below bin resolution with prism_zoom, and a level plus one
+# sinusoid per cycle is least-squares fitted to the raw volume. The
+# residual (volume minus that cycle model) is what the cycles don't explain.
+#
+# Stream: each new bar advances every ticker's cycle phasors by one
+# complex multiply, forms the residual, and scores it against a running
+# median / MAD tracked by stochastic approximation (sign updates scaled by
+# the current MAD). State per ticker is O(number of cycles); all tickers
+# are updated together as numpy vectors, so a bar for thousands of tickers
+# is a few dozen array ops and a historical replay is a loop over bars only.
+
+import argparse
+import pandas as pd
+import numpy as np
+
+from prism_channels import spectrum_2d, top_peaks
+from prism_zoom import refine_periods
+
+MAD_TO_SIGMA = 1.4826
+
+
+class ResidualDetector:
+    def __init__(self, level, periods, coef, med, mad, t0,
+                 threshold=6.0, alpha=0.02):
+        # level (T,), periods / coef (T, K): model(t) = level + Re(coef * z)
+        # with z = exp(2j*pi*t/periods); med / mad (T,) of the residual
+        self.level = np.asarray(level, dtype=float)
+        self.coef = np.asarray(coef, dtype=complex)
+        self.step = np.exp(2j * np.pi / np.asarray(periods, dtype=float))
+        self.phase = self.step ** t0
+        self.med = np.asarray(med, dtype=float).copy()
+        self.mad = np.maximum(np.asarray(mad, dtype=float), 1e-12)
+        self.threshold = threshold
+        self.alpha = alpha
+        self.t = t0
+
+    @classmethod
+    def fit(cls, history, cutoff_freq=0.5, max_period_days=3650,
+            max_keep_period=3 * 261, **kwargs):
+        # history: (sessions, tickers) volume on the business-day calendar
+        H = np.asarray(history, dtype=float)
+        N, T = H.shape
+        _, power, periods = spectrum_2d(H, cutoff_freq, max_period_days,
+                                        max_keep_period)
+        picks = top_peaks(power, periods)
+
+        K = max(1, max(len(p) for p in picks))
+        P = np.ones((T, K))            # period 1 + zero coef = no-op cycle
+        coef = np.zeros((T, K), dtype=complex)
+        level = np.empty(T)
+        resid = np.empty_like(H)
+        t = np.arange(N)
+        for j in range(T):
+            # bin-centred periods drift out of phase over a long replay,
+            # so pin each one down with a zoom around its FFT bin first
+            per = refine_periods(H[:, j] - H[:, j].mean(), periods[picks[j]])
+            ang = 2 * np.pi * t[:, None] / per[None, :]
+            A = np.hstack([np.ones((N, 1)), np.cos(ang), np.sin(ang)])
+            beta, *_ = np.linalg.lstsq(A, H[:, j], rcond=None)
+            k = len(per)
+            level[j] = beta[0]
+            P[j, :k] = per
+            coef[j, :k] = beta[1:k + 1] - 1j * beta[k + 1:]
+            resid[:, j] = H[:, j] - A @ beta
+
+        med = np.median(resid, axis=0)
+        mad = np.median(np.abs(resid - med), axis=0)
+        return cls(level, P, coef, med, mad, t0=N, **kwargs)
+
+    def model(self):
+        # cycle-model prediction for the current bar, (T,)
+        return self.level + (self.coef * self.phase).real.sum(axis=1)
+
+    def update(self, x):
+        # x: (T,) volumes for the next bar. Returns (residual, score, flag)
+        x = np.asarray(x, dtype=float)
+        r = x - self.model()
+        e = r - self.med
+        score = np.abs(e) / (MAD_TO_SIGMA * self.mad)
+        flag = score > self.threshold
+
+        # robust running median / MAD; NaN bars leave the state untouched
+        ok = np.isfinite(e)
+        eta = self.alpha * self.mad
+        self.med += np.where(ok, eta * np.sign(e), 0.0)
+        self.mad += np.where(ok, eta * np.sign(np.abs(e) - self.mad), 0.0)
+        np.maximum(self.mad, 1e-12, out=self.mad)
+
+        self.phase *= self.step
+        self.t += 1
+        if self.t % 1024 == 0:
+            self.phase /= np.abs(self.phase)   # keep phasors on the unit circle
+        return r, score, flag
+
+    def replay(self, X):
+        # X: (bars, T). Returns (scores, flags), both (bars, T)
+        X = np.asarray(X, dtype=float)
+        scores = np.empty(X.shape)
+        for i in range(len(X)):
+            _, scores[i], _ = self.update(X[i])
+        return scores, scores > self.threshold
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Residual anomaly detector")
+    parser.add_argument("--tickers", nargs="+", default=["AMZN"],
+                        help="Ticker symbols to fetch (e.g. AMZN AAPL)")
+    parser.add_argument("--data", metavar="DIR",
+                        help="read daily volume from a local CSV tree")
+    parser.add_argument("--train-end", default="2020-01-01",
+                        help="fit the cycle model before this date, "
+                             "replay from it")
+    parser.add_argument("--threshold", type=float, default=6.0,
+                        help="flag bars this many robust sigmas out")
+    return parser.parse_args()
+
+
+def main():
+    # business-day sessions, as in PRISM_5dWeek_BusinessDaysOnly
+    from PRISM_5dWeek_BusinessDaysOnly import fetch_volume
+
+    args = parse_args()
+    tickers = [t.upper() for t in args.tickers]
+    start_date, end_date = "2014-01-01", "2024-12-31"
+
+    vols = [fetch_volume(t, start_date, end_date, data_dir=args.data)
+            for t in tickers]
+    volume = pd.concat(vols, axis=1, keys=tickers).dropna()
+    train = volume[volume.index < args.train_end]
+    live = volume[volume.index >= args.train_end]
+
+    det = ResidualDetector.fit(train.to_numpy(), threshold=args.threshold)
+    scores, flags = det.replay(live.to_numpy())
+
+    print(f"Fitted on {len(train)} sessions, replayed {len(live)} sessions")
+    for j, ticker in enumerate(tickers):
+        hits = np.flatnonzero(flags[:, j])
+        top = hits[np.argsort(scores[hits, j])[::-1][:5]]
+        worst = ", ".join(f"{live.index[i].date()} ({scores[i, j]:.1f})"
+                          for i in top)
+        print(f"{ticker}: {len(hits)} flagged bars; strongest: {worst}")
+
+
+if __name__ == "__main__":
+    main()
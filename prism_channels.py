@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+
+# Multi-channel OHLCV spectrum in one pass.
+#
+#   python prism_channels.py --ticker AMZN
+#
+# yf.download already returns full OHLCV; instead of keeping only Volume,
+# build a (time x channel) array of volume, high-low range, close-to-close
+# returns and dollar volume on the business-day calendar used by
+# PRISM_5dWeek_BusinessDaysOnly, then center, low-pass filter, FFT and
+# find peaks for every channel in single calls along axis 0.
+
+import argparse
+import yfinance as yf
+import pandas as pd
+import numpy as np
+import matplotlib.pyplot as plt
+import scipy.fft
+from scipy.signal import filtfilt
+
+from prism_lean import design_taps
+
+CHANNELS = ("volume", "range", "returns", "dollar_volume")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Multi-channel FFT analyzer")
+    parser.add_argument("--ticker", default="AMZN",
+                        help="Ticker symbol to fetch (e.g. AMZN)")
+    parser.add_argument("--channels", nargs="+", default=list(CHANNELS),
+                        choices=CHANNELS, help="Channels to analyse")
+    return parser.parse_args()
+
+
+def fetch_channels(ticker: str, start: str, end: str,
+                   channels=CHANNELS) -> pd.DataFrame:
+    df = yf.download(ticker, start=start, end=end,
+                     progress=False, auto_adjust=False)
+    if isinstance(df.columns, pd.MultiIndex):
+        # (field, ticker) columns from newer yfinance
+        df.columns = df.columns.get_level_values(0)
+    ohlcv = df[["High", "Low", "Close", "Volume"]].dropna().sort_index()
+    ohlcv.index = pd.to_datetime(ohlcv.index)
+    # business-day frequency; fill any gaps (holidays) by carrying forward,
+    # so a holiday shows the previous range and a zero return
+    ohlcv = ohlcv.asfreq("B").ffill()
+
+    out = pd.DataFrame(index=ohlcv.index)
+    out["volume"] = ohlcv["Volume"]
+    out["range"] = ohlcv["High"] - ohlcv["Low"]
+    out["returns"] = ohlcv["Close"].pct_change().fillna(0.0)
+    out["dollar_volume"] = ohlcv["Close"] * ohlcv["Volume"]
+    return out[list(channels)]
+
+
+def low_pass_filter_2d(data, cutoff, fs=1.0, requested_taps=101):
+    # low_pass_filter applied down every column at once
+    arr = np.asarray(data, dtype=float)
+    if arr.ndim != 2:
+        raise ValueError(f"Expected 2-D (time, channel) input, got {arr.shape}")
+    taps, padlen = design_taps(arr.shape[0], float(cutoff), fs, requested_taps,
+                               dtype=np.float64)
+    padded = np.pad(arr, ((padlen, padlen), (0, 0)), mode="reflect")
+    return filtfilt(taps, 1.0, padded, axis=0)[padlen:-padlen]
+
+
+def spectrum_2d(data, cutoff_freq, max_period_days, max_keep_period):
+    # (freq_plot, power_plot[:, channel], period_plot), same bin selection
+    # as plot_fft: positive bins, period <= max_period_days, first/last bin
+    # dropped, then period <= max_keep_period
+    X = np.array(data, dtype=float)
+    X -= X.mean(axis=0)
+    filt = low_pass_filter_2d(X, cutoff=cutoff_freq)
+
+    N = filt.shape[0]
+    npos = (N + 1) // 2 - 1
+    spec = scipy.fft.rfft(filt, axis=0)
+    freq_pos = np.arange(1, npos + 1) * (1.0 / N)   # as np.fft.fftfreq
+    power = np.abs(spec[1:npos + 1])
+    periods = 1.0 / freq_pos
+
+    # periods fall with bin index, so both masks are trailing runs of bins
+    start = npos - np.searchsorted(periods[::-1], max_period_days,
+                                   side="right") + 1
+    stop = npos - 1
+    sel = periods[start:stop]
+    start += len(sel) - np.searchsorted(sel[::-1], max_keep_period,
+                                        side="right")
+    return freq_pos[start:stop], power[start:stop], periods[start:stop]
+
+
+def local_maxima(power):
+    # (bins, channels) boolean mask of interior local maxima, all channels
+    # in one comparison (plateaus count once, at their left edge)
+    peak = np.zeros(power.shape, dtype=bool)
+    peak[1:-1] = (power[1:-1] > power[:-2]) & (power[1:-1] >= power[2:])
+    return peak
+
+
+def top_peaks(power, periods, threshold=29, count=5, min_sep=1.1):
+    # per channel: strongest `count` short (< threshold) and long cycles,
+    # greedy min separation as in plot_fft; returns a list of index arrays
+    mask = local_maxima(power)
+    selected = []
+    for c in range(power.shape[1]):
+        idx = np.flatnonzero(mask[:, c])
+        idx = idx[np.argsort(power[idx, c])[::-1]]
+        picks = []
+        for group in (idx[periods[idx] < threshold],
+                      idx[periods[idx] >= threshold]):
+            chosen = []
+            for p in group:
+                if len(chosen) >= count:
+                    break
+                if all(abs(periods[p] - periods[q]) > min_sep for q in chosen):
+                    chosen.append(p)
+            picks += chosen
+        selected.append(np.sort(np.array(picks, dtype=int)))
+    return selected
+
+
+def report(channels, power, periods, selected):
+    for c, name in enumerate(channels):
+        idx = selected[c][np.argsort(power[selected[c], c])[::-1]]
+        cycles = ", ".join(f"{periods[i]:.1f}d" for i in idx)
+        print(f"{name:14s} {cycles}")
+
+
+def plot_channels(channels, freq, power, periods, selected, title):
+    fig, axes = plt.subplots(len(channels), 1, sharex=True,
+                             figsize=(12, 3 * len(channels)), squeeze=False)
+    for c, (ax, name) in enumerate(zip(axes[:, 0], channels)):
+        ax.plot(freq, power[:, c], lw=1)
+        for i in selected[c]:
+            ax.scatter(freq[i], power[i, c], color="red", s=20, zorder=5)
+            ax.annotate(f"{periods[i]:.1f}d", (freq[i], power[i, c]),
+                        xytext=(0, 5), textcoords="offset points",
+                        ha="center", va="bottom", fontsize=8, rotation=45)
+        ax.set_ylabel(name)
+        ax.grid(alpha=0.3, which="both", linestyle="--")
+    axes[0, 0].set_title(title)
+    axes[-1, 0].set_xscale("log")
+    axes[-1, 0].set_xlabel("1 / (business days)")
+    fig.tight_layout()
+    return fig
+
+
+def main():
+    args = parse_args()
+    ticker = args.ticker.upper()
+    start_date, end_date = "2014-01-01", "2024-12-31"
+
+    frame = fetch_channels(ticker, start_date, end_date, args.channels)
+    print(f"N = {len(frame)} samples x {frame.shape[1]} channels for {ticker} "
+          f"from {frame.index.min()} to {frame.index.max()}")
+
+    cutoff = 0.5  # 1/(2 business days)
+    freq, power, periods = spectrum_2d(frame.to_numpy(), cutoff,
+                                       max_period_days=3650,
+                                       max_keep_period=3 * 261)
+    selected = top_peaks(power, periods)
+    report(args.channels, power, periods, selected)
+
+    plot_channels(args.channels, freq, power, periods, selected,
+                  f"{ticker} Daily OHLCV Channels FFT (2014–2024)")
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
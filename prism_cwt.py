@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+
+# Batched Morlet continuous wavelet transform for time-localized cycles.
+#
+#   python prism_cwt.py --tickers AMZN AAPL MSFT --plot
+#
+# One FFT shows that a ~45-day cycle exists somewhere in 2014-2024; the CWT
+# shows when. Every scale is computed at once as a product in the frequency
+# domain (one forward FFT per ticker, one batched inverse FFT over
+# tickers x scales), so the cost is O(tickers * scales * N log N) instead of
+# the O(N * scales * width) of per-scale time-domain convolution.
+#
+# Input is the same centered, low-pass filtered series plot_fft uses.
+
+import argparse
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+import scipy.fft
+
+from prism_lean import LeanBuffers, low_pass_filter_lean
+
+W0 = 6.0  # Morlet centre frequency (Torrence & Compo 1998)
+
+
+def period_to_scale(periods, w0=W0):
+    # Fourier period of a Morlet at scale s is 4*pi*s / (w0 + sqrt(2 + w0^2))
+    periods = np.asarray(periods, dtype=float)
+    return periods * (w0 + np.sqrt(2 + w0 ** 2)) / (4 * np.pi)
+
+
+def log_periods(pmin, pmax, count):
+    return np.geomspace(pmin, pmax, count)
+
+
+def morlet_bank(scales, nfft, w0=W0, dtype=np.complex64):
+    # analytic Morlet in the frequency domain, (scales, nfft), normalized
+    # so that |W|^2 / scale is comparable across scales
+    omega = 2 * np.pi * scipy.fft.fftfreq(nfft)
+    s = np.asarray(scales)[:, None]
+    bank = np.where(omega > 0,
+                    np.pi ** -0.25 * np.sqrt(2 * np.pi * s)
+                    * np.exp(-0.5 * (s * omega - w0) ** 2),
+                    0.0)
+    return bank.astype(dtype)
+
+
+def cwt_power(x, periods, w0=W0, chunk=64):
+    # x: (N,) or (tickers, N), already centered / filtered.
+    # returns power (tickers, scales, N) as |W|^2 / scale
+    x = np.atleast_2d(np.asarray(x))
+    dtype = np.complex64 if x.dtype == np.float32 else np.complex128
+    T, N = x.shape
+    scales = period_to_scale(periods, w0)
+
+    # zero-pad past the widest wavelet so the circular convolution does not
+    # wrap the end of the series onto its start
+    nfft = scipy.fft.next_fast_len(N + min(N, int(np.ceil(4 * scales.max()))))
+    bank = morlet_bank(scales, nfft, w0, dtype)
+    inv_scale = (1.0 / scales).astype(x.dtype)[:, None]
+
+    power = np.empty((T, len(scales), N), dtype=x.real.dtype)
+    for i in range(0, T, chunk):
+        X = scipy.fft.fft(x[i:i + chunk], n=nfft, axis=-1).astype(dtype)
+        W = scipy.fft.ifft(X[:, None, :] * bank[None, :, :], axis=-1,
+                           overwrite_x=True, workers=-1)[..., :N]
+        np.multiply(np.abs(W) ** 2, inv_scale, out=power[i:i + chunk])
+    return power
+
+
+def cone_of_influence(N, periods, w0=W0):
+    # (scales, N) True where edge effects are negligible (e-folding time
+    # sqrt(2) * scale from either end)
+    efold = np.sqrt(2) * period_to_scale(periods, w0)[:, None]
+    t = np.arange(N)[None, :]
+    return (t >= efold) & (t <= N - 1 - efold)
+
+
+def ridge(power, periods, coi=None):
+    # dominant period at every time step, (tickers, N); NaN where the
+    # strongest scale is inside the cone of influence
+    idx = np.argmax(power, axis=1)
+    dominant = np.asarray(periods, dtype=float)[idx]
+    if coi is not None:
+        dominant[~coi[idx, np.arange(idx.shape[1])]] = np.nan
+    return dominant
+
+
+def filtered_batch(series, cutoff_freq, dtype=np.float32):
+    # stack equal-length volume series into (tickers, N) filtered rows
+    buffers = LeanBuffers()
+    rows = [low_pass_filter_lean(s, cutoff=cutoff_freq, buffers=buffers)
+            for s in series]
+    return np.stack(rows).astype(dtype, copy=False)
+
+
+def analyze(series, periods, cutoff_freq=0.5, w0=W0):
+    # series: list of equal-length 1-D arrays -> (power, dominant, coi)
+    x = filtered_batch(series, cutoff_freq)
+    power = cwt_power(x, periods, w0)
+    coi = cone_of_influence(x.shape[1], periods, w0)
+    return power, ridge(power, periods, coi), coi
+
+
+def plot_scalogram(index, power, periods, dominant, coi, title):
+    fig, ax = plt.subplots(figsize=(14, 6))
+    shown = np.where(coi, power, np.nan)
+    ax.pcolormesh(index, periods, shown, shading="auto", cmap="viridis")
+    ax.plot(index, dominant, color="red", lw=1, label="ridge")
+    ax.set_yscale("log")
+    ax.set_ylabel("Period (business days)")
+    ax.set_xlabel("Date")
+    ax.set_title(title)
+    ax.legend(loc="upper right")
+    fig.tight_layout()
+    return fig
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Morlet CWT volume analyzer")
+    parser.add_argument("--tickers", nargs="+", default=["AMZN"],
+                        help="Ticker symbols to fetch (e.g. AMZN AAPL)")
+    parser.add_argument("--data", metavar="DIR",
+                        help="read daily volume from a local CSV tree")
+    parser.add_argument("--min-period", type=float, default=4.0)
+    parser.add_argument("--max-period", type=float, default=300.0)
+    parser.add_argument("--scales", type=int, default=64)
+    parser.add_argument("--plot", action="store_true",
+                        help="show a scalogram per ticker")
+    return parser.parse_args()
+
+
+def main():
+    # business-day series, as in PRISM_5dWeek_BusinessDaysOnly
+    from PRISM_5dWeek_BusinessDaysOnly import fetch_volume
+
+    args = parse_args()
+    tickers = [t.upper() for t in args.tickers]
+    start_date, end_date = "2014-01-01", "2024-12-31"
+
+    vols = [fetch_volume(t, start_date, end_date, data_dir=args.data)
+            for t in tickers]
+    # align on the common business-day index so the batch is rectangular
+    frame = pd.concat(vols, axis=1, keys=tickers).dropna()
+    periods = log_periods(args.min_period, args.max_period, args.scales)
+    power, dominant, coi = analyze([frame[t].to_numpy() for t in tickers],
+                                   periods)
+
+    years = frame.index.year
+    for i, ticker in enumerate(tickers):
+        by_year = pd.Series(dominant[i], index=frame.index).groupby(years)
+        summary = ", ".join(f"{y}: {p:.1f}d" for y, p in by_year.median().items()
+                            if np.isfinite(p))
+        print(f"{ticker} dominant period by year: {summary}")
+
+    if args.plot:
+        for i, ticker in enumerate(tickers):
+            plot_scalogram(frame.index, power[i], periods, dominant[i], coi,
+                           f"{ticker} Daily Volume Morlet CWT")
+        plt.show()
+
+
+if __name__ == "__main__":
+    main()
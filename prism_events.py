@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+
+# Event-aligned (superposed epoch) volume profiles.
+#
+#   python prism_events.py --tickers AMZN AAPL --events events.csv --opex
+#
+# The event calendar is a local CSV with columns date,event[,ticker]; rows
+# with an empty ticker (OpEx, index rebalances, ...) apply to every ticker,
+# rows with a ticker (earnings) only to that one. --opex adds monthly
+# option expiries (third Friday) without needing them in the file.
+#
+# Volumes come from fetch_volume in PRISM_5dWeek_BusinessDaysOnly, so events
+# are lined up on the same business-day sessions as the FFT. Every window
+# around every event for every ticker is a row of one sliding_window_view
+# over the (sessions x tickers) array, gathered in a single indexing step;
+# mean / dispersion profiles are then plain reductions over that stack.
+
+import argparse
+import pandas as pd
+import numpy as np
+import matplotlib.pyplot as plt
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Event-aligned volume study")
+    parser.add_argument("--tickers", nargs="+", default=["AMZN"],
+                        help="Ticker symbols to fetch (e.g. AMZN AAPL)")
+    parser.add_argument("--data", metavar="DIR",
+                        help="read daily volume from a local CSV tree")
+    parser.add_argument("--events", metavar="CSV",
+                        help="event calendar with columns date,event[,ticker]")
+    parser.add_argument("--opex", action="store_true",
+                        help="add monthly option expiries (third Friday)")
+    parser.add_argument("--pre", type=int, default=10,
+                        help="sessions before each event")
+    parser.add_argument("--post", type=int, default=10,
+                        help="sessions after each event")
+    return parser.parse_args()
+
+
+def load_events(path):
+    ev = pd.read_csv(path)
+    ev.columns = ev.columns.str.strip().str.lower()
+    if "date" not in ev.columns or "event" not in ev.columns:
+        raise ValueError(f"{path}: expected 'date' and 'event' columns")
+    if "ticker" not in ev.columns:
+        ev["ticker"] = ""
+    ev["date"] = pd.to_datetime(ev["date"]).dt.tz_localize(None).dt.normalize()
+    ev["ticker"] = ev["ticker"].fillna("").astype(str).str.strip().str.upper()
+    return ev[["date", "event", "ticker"]]
+
+
+def opex_dates(start, end):
+    # third Friday of every month
+    fridays = pd.date_range(start, end, freq="W-FRI")
+    third = fridays[(fridays.day >= 15) & (fridays.day <= 21)]
+    return pd.DataFrame({"date": third, "event": "OpEx", "ticker": ""})
+
+
+def event_positions(index, events, tickers, pre, post):
+    # (session position, ticker column, event label) for every event/ticker
+    # pair whose full window fits; events on non-session days move to the
+    # next session. Events before the first session or after the last one
+    # have no session of their own and are dropped, not clamped
+    dates = events["date"].to_numpy()
+    pos = index.searchsorted(dates)
+    inside = pos < len(index)
+    inside &= (pos > 0) | (dates == index[0].to_datetime64())
+    ok = inside & (pos >= pre) & (pos + post < len(index))
+    events, pos = events[ok], pos[ok]
+
+    # market-wide rows fan out to every ticker column; ticker rows look up
+    # their column (-1 for tickers not in this run, which are dropped)
+    n = len(tickers)
+    labels = events["event"].to_numpy(dtype=object)
+    names = events["ticker"].to_numpy(dtype=object)
+    wide = names == ""
+    k = int(wide.sum())
+    col = pd.Index(tickers).get_indexer(names[~wide])
+    known = col >= 0
+
+    p = np.concatenate([np.repeat(pos[wide], n), pos[~wide][known]])
+    c = np.concatenate([np.tile(np.arange(n), k), col[known]])
+    lab = np.concatenate([np.repeat(labels[wide], n), labels[~wide][known]])
+    return p.astype(int), c.astype(int), lab
+
+
+def event_windows(volume, pos, cols, pre, post):
+    # volume: (sessions, tickers). Returns (events, pre + post + 1) windows,
+    # each scaled by its own mean so large and small tickers average
+    # together; offset 0 is the event session
+    X = np.asarray(volume, dtype=float)
+    view = sliding_window_view(X, pre + post + 1, axis=0)  # no copy
+    windows = view[pos - pre, cols]                          # one gather
+    means = windows.mean(axis=1, keepdims=True)
+    np.divide(windows, means, out=windows, where=means > 0)
+    return windows
+
+
+def profiles(windows, labels, cols, n_tickers):
+    # per event label: mean, std, median, count over all tickers, plus the
+    # per-ticker mean profile (tickers, window) with NaN where no events
+    out = {}
+    for label in pd.unique(labels):
+        sel = labels == label
+        w, c = windows[sel], cols[sel]
+        counts = np.bincount(c, minlength=n_tickers)
+        # per-ticker sums: one weighted bincount over (ticker, offset) cells
+        width = w.shape[1]
+        cell = (c[:, None] * width + np.arange(width)).ravel()
+        sums = np.bincount(cell, weights=w.ravel(),
+                           minlength=n_tickers * width).reshape(n_tickers, width)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            per_ticker = sums / counts[:, None]
+        out[label] = {
+            "mean": w.mean(axis=0),
+            "std": w.std(axis=0),
+            "median": np.median(w, axis=0),
+            "count": len(w),
+            "per_ticker": per_ticker,
+        }
+    return out
+
+
+def plot_profiles(result, pre, post, title):
+    offsets = np.arange(-pre, post + 1)
+    fig, ax = plt.subplots(figsize=(12, 6))
+    for label, prof in result.items():
+        line, = ax.plot(offsets, prof["mean"], lw=1.5,
+                        label=f"{label} (n={prof['count']})")
+        ax.fill_between(offsets, prof["mean"] - prof["std"],
+                        prof["mean"] + prof["std"],
+                        color=line.get_color(), alpha=0.15)
+    ax.axvline(0, color="gray", linestyle="--", alpha=0.6)
+    ax.axhline(1, color="gray", linestyle=":", alpha=0.6)
+    ax.set_xlabel("Sessions from event")
+    ax.set_ylabel("Volume / window mean")
+    ax.set_title(title)
+    ax.grid(alpha=0.3, linestyle="--")
+    ax.legend()
+    fig.tight_layout()
+    return fig
+
+
+def main():
+    # business-day sessions, as in PRISM_5dWeek_BusinessDaysOnly
+    from PRISM_5dWeek_BusinessDaysOnly import fetch_volume
+
+    args = parse_args()
+    tickers = [t.upper() for t in args.tickers]
+    start_date, end_date = "2014-01-01", "2024-12-31"
+
+    frames = [load_events(args.events)] if args.events else []
+    if args.opex:
+        frames.append(opex_dates(start_date, end_date))
+    if not frames:
+        raise SystemExit("No events: pass --events CSV and/or --opex")
+    events = pd.concat(frames, ignore_index=True)
+
+    vols = [fetch_volume(t, start_date, end_date, data_dir=args.data)
+            for t in tickers]
+    volume = pd.concat(vols, axis=1, keys=tickers).dropna()
+
+    pos, cols, labels = event_positions(volume.index, events, tickers,
+                                        args.pre, args.post)
+    windows = event_windows(volume.to_numpy(), pos, cols, args.pre, args.post)
+    result = profiles(windows, labels, cols, len(tickers))
+
+    for label, prof in result.items():
+        peak = int(np.argmax(prof["mean"])) - args.pre
+        print(f"{label}: {prof['count']} windows, event-day volume "
+              f"{prof['mean'][args.pre]:.2f}x window mean "
+              f"(std {prof['std'][args.pre]:.2f}), peak at offset {peak:+d}")
+
+    plot_profiles(result, args.pre, args.post,
+                  f"Event-aligned volume: {', '.join(tickers)}")
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
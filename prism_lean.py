@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+
+# Memory-lean version of the PRISM spectrum pipeline.
+#
+# Same steps as plot_fft in the PRISM_* scripts (center -> reflect pad ->
+# FIR filtfilt -> FFT -> positive bins -> period masks) but:
+#   * float32 end to end (volumes have far fewer significant digits)
+#   * the series is written straight into a reused, pre-padded buffer and
+#     centered in place, so no astype / centered / np.pad copies
+#   * real FFT (rfft) instead of a full complex128 FFT that is half discarded
+#   * the period masks are contiguous runs of bins, so they become slices
+#     (views) instead of chained boolean-mask copies
+
+import tracemalloc
+from functools import lru_cache
+
+import numpy as np
+import scipy.fft
+from scipy.signal import firwin, filtfilt
+
+
+class LeanBuffers:
+    # grow-only scratch arrays, reused across tickers / calls
+    def __init__(self):
+        self._bufs = {}
+
+    def get(self, name, n, dtype=np.float32):
+        buf = self._bufs.get(name)
+        if buf is None or buf.dtype != dtype or len(buf) < n:
+            buf = np.empty(n, dtype=dtype)
+            self._bufs[name] = buf
+        return buf[:n]
+
+    def nbytes(self):
+        return sum(b.nbytes for b in self._bufs.values())
+
+
+@lru_cache(maxsize=32)
+def design_taps(N, cutoff, fs=1.0, requested_taps=101, dtype=np.float32):
+    # identical tap selection to low_pass_filter in the PRISM scripts;
+    # firwin designs in float64, dtype only sets the returned precision
+    numtaps = min(requested_taps, N - 1)
+    if numtaps % 2 == 0:
+        numtaps -= 1
+    nyq = fs / 2.0
+    cutoff_norm = min((cutoff/nyq)*0.99, 0.99)
+
+    taps = firwin(numtaps, cutoff_norm, window="hamming")
+    padlen = 3 * len(taps)
+    while numtaps > 3 and padlen >= N:
+        numtaps -= 2
+        taps = firwin(numtaps, cutoff_norm, window="hamming")
+        padlen = 3 * len(taps)
+
+    taps = taps.astype(dtype)
+    taps.flags.writeable = False
+    return taps, padlen
+
+
+_ONE = np.ones(1, dtype=np.float32)
+
+
+def low_pass_filter_lean(data, cutoff, fs=1.0, requested_taps=101,
+                         buffers=None, center=True):
+    arr = np.asarray(data).squeeze()
+    if arr.ndim != 1:
+        raise ValueError(f"Expected 1-D input, got {arr.shape}")
+    N = len(arr)
+    if buffers is None:
+        buffers = LeanBuffers()
+
+    taps, padlen = design_taps(N, float(cutoff), fs, requested_taps)
+    if padlen >= N:
+        # reflect padding wraps several times; leave that to np.pad
+        work = arr.astype(np.float32)
+        if center:
+            work -= work.mean(dtype=np.float64)
+        padded = np.pad(work, padlen, mode="reflect")
+    else:
+        padded = buffers.get("padded", N + 2 * padlen)
+        body = padded[padlen:padlen + N]
+        body[:] = arr                   # cast to float32 on assignment
+        if center:
+            body -= body.mean(dtype=np.float64)
+        # same layout np.pad(..., mode="reflect") would produce
+        padded[:padlen] = body[padlen:0:-1]
+        padded[padlen + N:] = body[-2:-padlen - 2:-1]
+
+    filtered_padded = filtfilt(taps, _ONE, padded)
+    return filtered_padded[padlen:-padlen]
+
+
+def lean_spectrum(data, cutoff_freq, max_period_days, max_keep_period,
+                  period_scale=1.0, buffers=None, copy=False):
+    # returns (freq_plot, power_plot, period_plot) matching plot_fft:
+    # positive bins with period <= max_period_days, first/last bin dropped,
+    # periods scaled by period_scale, then period <= max_keep_period.
+    # The arrays are views into `buffers` and are only valid until the next
+    # call with the same buffers; pass copy=True to keep them per ticker.
+    if buffers is None:
+        buffers = LeanBuffers()
+
+    filt = low_pass_filter_lean(data, cutoff=cutoff_freq, buffers=buffers)
+    N = len(filt)
+    spec = scipy.fft.rfft(filt)
+
+    # bins fftfreq would report as strictly positive (excludes the
+    # Nyquist bin of even-length input, which fftfreq makes negative)
+    npos = (N + 1) // 2 - 1
+    freq_pos = buffers.get("freq", npos)
+    freq_pos[:] = np.arange(1, npos + 1, dtype=np.float32)
+    freq_pos /= N
+
+    power = buffers.get("power", npos)
+    np.abs(spec[1:npos + 1], out=power)
+    del spec
+
+    periods = buffers.get("period", npos)
+    np.divide(1.0, freq_pos, out=periods)
+
+    # periods fall monotonically with bin index, so "periods <= limit" is a
+    # trailing run of bins; count it on a reversed view
+    start = npos - np.searchsorted(periods[::-1], max_period_days, side="right")
+    stop = npos - 1
+    start += 1
+
+    if period_scale != 1.0:
+        periods[start:stop] *= period_scale
+    sel = periods[start:stop]
+    start += len(sel) - np.searchsorted(sel[::-1], max_keep_period,
+                                        side="right")
+
+    out = freq_pos[start:stop], power[start:stop], periods[start:stop]
+    if copy:
+        out = tuple(a.copy() for a in out)
+    return out
+
+
+def track_peak(fn, *args, **kwargs):
+    # run fn and report the peak bytes allocated while it ran (numpy
+    # reports its data buffers to tracemalloc)
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    try:
+        result = fn(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return result, peak - base
+
+
+def format_bytes(n):
+    return f"{n / 2**20:.2f} MiB"
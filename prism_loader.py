@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+
+# Parallel, schema-tolerant loader for the local data/ CSV tree.
+#
+#   python prism_loader.py --root data
+#
+# The tree mixes several CSV layouts written by different pull scripts:
+#   Date,Volume + "2010-01-04 00:00:00-05:00"   daily / weekly, tz offsets
+#   Date,Volume + ",SPY" row + "2025-01-21 14:30:00"   hourly, naive UTC
+#   Year-Month,Volume + "1980-01"   monthly
+# Each file is sniffed from its first lines. Small files (the whole tree
+# today) are split in Python and their time columns parsed together in one
+# vectorized pass, since per-file numpy overhead dwarfs the parsing itself;
+# large archives go to a process pool with the fastest pandas CSV engine
+# (pyarrow when installed). The rows are merged into one sorted,
+# deduplicated structured array per (ticker, resolution).
+#
+# Times are datetime64[ns]. Intraday rows are UTC; daily and coarser rows
+# are keyed by their local session date (midnight), matching what yfinance
+# gives for daily bars.
+
+import argparse
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    FAST_ENGINE = "pyarrow"
+except ImportError:
+    FAST_ENGINE = "c"
+
+SERIES_DTYPE = np.dtype([("time", "datetime64[ns]"), ("volume", "int64")])
+RESOLUTIONS = ("intraday", "daily", "weekly", "monthly")
+SMALL_FILE = 1 << 20
+
+
+def discover(root):
+    return sorted(glob.glob(os.path.join(root, "**", "*.csv"), recursive=True))
+
+
+def ticker_from_name(path):
+    # AMZN_volume_2010_01.csv -> AMZN, sp500_volume_1980s.csv -> SP500
+    name = os.path.splitext(os.path.basename(path))[0]
+    return name.split("_volume")[0].split("_")[0].upper()
+
+
+def sniff_schema(path):
+    with open(path, "r", newline="") as fh:
+        header = fh.readline().strip().split(",")
+        second = fh.readline().strip().split(",")
+    schema = {
+        "time_col": header[0],
+        "value_col": header[1] if len(header) > 1 else None,
+        "skiprows": None,
+        "ticker": ticker_from_name(path),
+        "monthly": header[0].strip().lower() == "year-month",
+    }
+    # yfinance multi-index leftovers: a second header row ",SPY" with an
+    # empty date cell naming the ticker
+    if second and second[0] == "" and len(second) > 1:
+        schema["skiprows"] = [1]
+        if second[1]:
+            schema["ticker"] = second[1].strip().upper()
+    return schema
+
+
+def parse_times(strs, monthly=False):
+    # returns (local datetime64[ns], UTC offset in minutes) per row; rows
+    # without an offset get 0. Offsets are split off row by row, so files
+    # mixing "-05:00", "-04:00" and naive rows keep their local wall times.
+    # The fixed-width ISO layouts go straight through numpy; only the rows
+    # in any other layout fall back to pandas one at a time
+    n = len(strs)
+    offsets = np.zeros(n, dtype=np.int64)
+    if monthly:
+        return strs.astype("datetime64[M]").astype("datetime64[ns]"), offsets
+    if n == 0:
+        return np.empty(0, dtype="datetime64[ns]"), offsets
+
+    width = np.char.str_len(strs)
+    chars = strs.astype("U25").view("U1").reshape(n, 25)
+    has = (width == 25) & np.isin(chars[:, 19], ["+", "-"])
+    if has.any():
+        hh = chars[has][:, 20:22]
+        mm = chars[has][:, 23:25]
+        minutes = ((hh[:, 0].astype(int) * 10 + hh[:, 1].astype(int)) * 60
+                   + mm[:, 0].astype(int) * 10 + mm[:, 1].astype(int))
+        offsets[has] = np.where(chars[has][:, 19] == "-", -minutes, minutes)
+    local_strs = np.where(has, strs.astype("U19"), strs)
+
+    # plain "YYYY-MM-DD" / "YYYY-MM-DD HH:MM:SS": numpy parses them as
+    # naive wall times (anything else, e.g. a "Z" suffix, numpy would shift)
+    local = np.empty(n, dtype="datetime64[ns]")
+    plain = np.isin(np.char.str_len(local_strs), [10, 19])
+    try:
+        local[plain] = local_strs[plain].astype("datetime64[ns]")
+    except ValueError:
+        plain[:] = False
+
+    for i in np.flatnonzero(~plain):
+        text = local_strs[i]
+        try:
+            ts = pd.Timestamp(str(text))
+        except ValueError:
+            local[i] = np.datetime64("NaT")
+            continue
+        if ts.tzinfo is not None:
+            offsets[i] = int(ts.utcoffset().total_seconds() // 60)
+            ts = ts.tz_localize(None)
+        local[i] = ts.to_datetime64()
+    return local, offsets
+
+
+def classify(times, monthly=False):
+    if monthly:
+        return "monthly"
+    if len(times) == 0:
+        return "daily"
+    day = times.astype("datetime64[D]")
+    if (times != day).any():
+        return "intraday"
+    if len(times) > 1 and np.median(np.diff(np.sort(day)).astype(int)) >= 5:
+        return "weekly"
+    return "daily"
+
+
+def read_columns(path, schema, engine=None):
+    # (time strings, volumes); small files are split in Python, which beats
+    # read_csv's per-call overhead by a wide margin on the 20-row monthly
+    # files, large archives go through the fastest pandas engine
+    if os.path.getsize(path) < SMALL_FILE:
+        skip = 1 if schema["skiprows"] is None else 2
+        with open(path, "r", newline="") as fh:
+            cells = [line.split(",", 2) for line in fh.read().splitlines()[skip:]]
+        cells = [c for c in cells if len(c) > 1 and c[0] and c[1]]
+        times = np.array([c[0].strip() for c in cells], dtype=str)
+        vols = np.array([c[1] for c in cells], dtype=np.float64)
+        return times, vols
+
+    engine = engine or (FAST_ENGINE if schema["skiprows"] is None else "c")
+    df = pd.read_csv(path, skiprows=schema["skiprows"], engine=engine,
+                     usecols=[schema["time_col"], schema["value_col"]],
+                     dtype={schema["time_col"]: str}).dropna()
+    return (df[schema["time_col"]].str.strip().to_numpy(dtype=str),
+            df[schema["value_col"]].to_numpy(dtype=np.float64))
+
+
+def read_schema(path):
+    schema = sniff_schema(path)
+    if schema["value_col"] is None:
+        raise ValueError(f"{path}: expected a time and a volume column")
+    return schema
+
+
+def to_series(schema, times, offsets, vols):
+    ok = ~np.isnat(times)
+    times, offsets, vols = times[ok], offsets[ok], vols[ok]
+    # classify on local wall time: a daily bar is midnight local whatever
+    # its offset; only intraday rows are moved to UTC
+    resolution = classify(times, schema["monthly"])
+    if resolution == "intraday":
+        times = times - offsets.astype("timedelta64[m]")
+
+    arr = np.empty(len(times), dtype=SERIES_DTYPE)
+    arr["time"] = times
+    arr["volume"] = vols
+    return schema["ticker"], resolution, arr
+
+
+def read_file(path, engine=None):
+    schema = read_schema(path)
+    strs, vols = read_columns(path, schema, engine)
+    times, offsets = parse_times(strs, schema["monthly"])
+    return to_series(schema, times, offsets, vols)
+
+
+def read_small_files(paths):
+    # read_file for many small files, with one parse_times call per time
+    # layout (monthly or not) over all their rows instead of one per file
+    schemas = [read_schema(p) for p in paths]
+    cols = [read_columns(p, sc) for p, sc in zip(paths, schemas)]
+    parsed = [None] * len(paths)
+    for monthly in (False, True):
+        idx = [i for i, sc in enumerate(schemas) if sc["monthly"] == monthly]
+        if not idx:
+            continue
+        strs = np.concatenate([cols[i][0] for i in idx])
+        times, offsets = parse_times(strs, monthly)
+        bounds = np.cumsum([len(cols[i][0]) for i in idx])[:-1]
+        for i, t, o in zip(idx, np.split(times, bounds),
+                           np.split(offsets, bounds)):
+            parsed[i] = t, o
+    return [to_series(sc, t, o, c[1])
+            for sc, (t, o), c in zip(schemas, parsed, cols)]
+
+
+def read_files(paths, workers=None, engine=None):
+    # (ticker, resolution, array) per path, in path order
+    small = [p for p in paths if os.path.getsize(p) < SMALL_FILE]
+    large = [p for p in paths if os.path.getsize(p) >= SMALL_FILE]
+    done = dict(zip(small, read_small_files(small)))
+    if large:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            done.update(zip(large, pool.map(partial(read_file, engine=engine),
+                                            large)))
+    return [done[p] for p in paths]
+
+
+def merge(parts):
+    # sort by time and drop duplicate timestamps (last file read wins)
+    arr = np.concatenate(parts)
+    arr = arr[np.argsort(arr["time"], kind="stable")]
+    keep = np.ones(len(arr), dtype=bool)
+    keep[:-1] = arr["time"][1:] != arr["time"][:-1]
+    return arr[keep]
+
+
+def load_tree(root, workers=None, engine=None):
+    results = read_files(discover(root), workers, engine)
+
+    grouped = {}
+    for ticker, resolution, arr in results:
+        grouped.setdefault((ticker, resolution), []).append(arr)
+    return {key: merge(parts) for key, parts in sorted(grouped.items())}
+
+
+def load_series(root, ticker, resolution="daily", start=None, end=None,
+                workers=None):
+    # one ticker as a pd.Series, end exclusive (as yf.download)
+    # pick files by the sniffed ticker, as read_file labels them (a ",SPY"
+    # second header row overrides the file name)
+    files = [f for f in discover(root)
+             if sniff_schema(f)["ticker"] == ticker.upper()]
+    results = read_files(files, workers)
+    parts = [arr for t, r, arr in results
+             if t == ticker.upper() and r == resolution]
+    if not parts:
+        raise ValueError(f"No {resolution} data for {ticker} under {root}")
+
+    arr = merge(parts)
+    vol = pd.Series(arr["volume"], index=pd.DatetimeIndex(arr["time"]),
+                    name="Volume")
+    if start is not None:
+        vol = vol[vol.index >= pd.Timestamp(start)]
+    if end is not None:
+        vol = vol[vol.index < pd.Timestamp(end)]
+    return vol
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load the local CSV tree")
+    parser.add_argument("--root", default="data",
+                        help="Directory searched recursively for *.csv")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processes for large files "
+                             "(default: executor default)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    t0 = time.perf_counter()
+    series = load_tree(args.root, workers=args.workers)
+    elapsed = time.perf_counter() - t0
+
+    print(f"Loaded {len(discover(args.root))} CSV files in {elapsed:.2f}s "
+          f"(engine: {FAST_ENGINE})")
+    for (ticker, resolution), arr in series.items():
+        print(f"  {ticker:6s} {resolution:8s} {len(arr):6d} rows  "
+              f"{arr['time'][0]} -> {arr['time'][-1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+
+# Multi-resolution spectrum tiles + a small local viewer.
+#
+#   python prism_tiles.py build --tickers AMZN AAPL MSFT
+#   python prism_tiles.py serve            # http://127.0.0.1:8050/
+#
+# Each ticker's positive-frequency spectrum is stored as a min/max
+# decimated pyramid: level 0 is the raw FFT bins, level k merges 2**k
+# neighbouring bins into one (min, max) bucket. Every level is cut into
+# fixed-size tiles of little-endian float32 rows (freq, min, max). The
+# viewer's frequency axis is logarithmic, so one pixel spans more bins the
+# higher the frequency; it walks the view in stretches, picking for each
+# the level that gives roughly one bucket per pixel there, and only fetches
+# the tiles covering those stretches.
+#
+# Layout:  <root>/index.json
+#          <root>/<TICKER>/meta.json
+#          <root>/<TICKER>/<level>/<tile>.bin
+
+import argparse
+import http.server
+import json
+import os
+import shutil
+from functools import partial
+
+import numpy as np
+import scipy.fft
+
+from prism_lean import LeanBuffers, low_pass_filter_lean
+
+TILE_SIZE = 1024
+TILE_DTYPE = np.dtype("<f4")
+
+
+def full_spectrum(data, cutoff_freq, buffers=None):
+    # same front end as plot_fft (center, reflect pad, FIR filtfilt), all
+    # positive bins kept; d = 1 sample
+    filt = low_pass_filter_lean(data, cutoff=cutoff_freq, buffers=buffers)
+    N = len(filt)
+    npos = (N + 1) // 2 - 1
+    spec = scipy.fft.rfft(filt)
+    freq = np.arange(1, npos + 1, dtype=np.float64) / N
+    return freq, np.abs(spec[1:npos + 1])
+
+
+def build_pyramid(power):
+    # [(min, max)] per level, halving the bucket count until one tile fits
+    lo = hi = np.asarray(power, dtype=np.float32)
+    levels = [(lo, hi)]
+    while len(lo) > TILE_SIZE:
+        n = len(lo) // 2 * 2
+        pad_lo, pad_hi = lo[n:], hi[n:]   # odd leftover becomes its own bucket
+        lo = np.concatenate([lo[:n].reshape(-1, 2).min(axis=1), pad_lo])
+        hi = np.concatenate([hi[:n].reshape(-1, 2).max(axis=1), pad_hi])
+        levels.append((lo, hi))
+    return levels
+
+
+def write_tiles(out_dir, ticker, freq, power, unit="samples",
+                known_periods=None, extra_meta=None):
+    tdir = os.path.join(out_dir, ticker)
+    shutil.rmtree(tdir, ignore_errors=True)
+
+    levels = build_pyramid(power)
+    level_meta = []
+    for level, (lo, hi) in enumerate(levels):
+        # bucket freq = its first level-0 bin, so the x axis needs no lookup
+        f = freq[::2 ** level][:len(lo)]
+        rows = np.empty((len(lo), 3), dtype=TILE_DTYPE)
+        rows[:, 0], rows[:, 1], rows[:, 2] = f, lo, hi
+
+        ldir = os.path.join(tdir, str(level))
+        os.makedirs(ldir, exist_ok=True)
+        ntiles = -(-len(rows) // TILE_SIZE)
+        for t in range(ntiles):
+            rows[t * TILE_SIZE:(t + 1) * TILE_SIZE].tofile(
+                os.path.join(ldir, f"{t}.bin"))
+        level_meta.append({"buckets": len(rows), "tiles": ntiles,
+                           "min": float(lo.min()), "max": float(hi.max())})
+
+    meta = {
+        "ticker": ticker,
+        "tile_size": TILE_SIZE,
+        "bins": len(freq),
+        "f0": float(freq[0]),
+        "df": float(freq[1] - freq[0]) if len(freq) > 1 else 1.0,
+        "unit": unit,
+        "known_periods": known_periods or {},
+        "levels": level_meta,
+    }
+    meta.update(extra_meta or {})
+    with open(os.path.join(tdir, "meta.json"), "w") as fh:
+        json.dump(meta, fh)
+    update_index(out_dir)
+    return meta
+
+
+def update_index(out_dir):
+    tickers = sorted(d for d in os.listdir(out_dir)
+                     if os.path.isfile(os.path.join(out_dir, d, "meta.json")))
+    with open(os.path.join(out_dir, "index.json"), "w") as fh:
+        json.dump({"tickers": tickers}, fh)
+    return tickers
+
+
+def read_tile(out_dir, ticker, level, tile):
+    path = os.path.join(out_dir, ticker, str(level), f"{tile}.bin")
+    return np.fromfile(path, dtype=TILE_DTYPE).reshape(-1, 3)
+
+
+VIEWER_HTML = """<!doctype html>
+<html><head><meta charset="utf-8"><title>PRISM spectra</title>
+<style>
+ body { font: 13px sans-serif; margin: 0; }
+ #bar { padding: 6px 10px; background: #eee; }
+ #bar span { margin-left: 12px; color: #555; }
+ canvas { display: block; width: 100vw; height: calc(100vh - 34px); }
+</style></head><body>
+<div id="bar">
+ <select id="ticker"></select>
+ <label><input type="checkbox" id="logy"> log amplitude</label>
+ <button id="reset">reset</button>
+ <span id="info"></span>
+</div>
+<canvas id="cv"></canvas>
+<script>
+const cv = document.getElementById("cv"), ctx = cv.getContext("2d");
+const info = document.getElementById("info");
+let meta = null, view = null, tiles = new Map(), dragX = null;
+
+async function loadTicker(t) {
+  meta = await (await fetch(`${t}/meta.json`)).json();
+  tiles = new Map();
+  resetView();
+}
+function resetView() {
+  const fmax = meta.f0 + meta.df * (meta.bins - 1);
+  view = [Math.log10(meta.f0), Math.log10(fmax)];
+  draw();
+}
+function tile(level, t) {
+  const key = `${level}/${t}`;
+  if (!tiles.has(key)) {
+    // responses land in the cache of the ticker that asked for them; a
+    // ticker switch mid-flight leaves them in the old, discarded map
+    const cache = tiles;
+    cache.set(key, null);
+    fetch(`${meta.ticker}/${key}.bin`)
+      .then(r => {
+        if (!r.ok) throw new Error(`tile ${key}: HTTP ${r.status}`);
+        return r.arrayBuffer();
+      })
+      .then(b => { cache.set(key, new Float32Array(b));
+                   if (cache === tiles) draw(); })
+      .catch(e => { cache.set(key, new Float32Array(0)); console.warn(e); });
+  }
+  return tiles.get(key);
+}
+function draw() {
+  const W = cv.width = cv.clientWidth, H = cv.height = cv.clientHeight;
+  ctx.clearRect(0, 0, W, H);
+  if (!meta) return;
+  const [l0, l1] = view, f0 = 10 ** l0, f1 = 10 ** l1;
+  const i0 = Math.max(0, Math.floor((f0 - meta.f0) / meta.df));
+  const i1 = Math.min(meta.bins - 1, Math.ceil((f1 - meta.f0) / meta.df));
+  // on the log axis bin i (frequency f) is f ln10 (l1 - l0) / (df W) bins
+  // per pixel; walk the view in stretches where that picks one level
+  const top = meta.levels.length - 1, span = Math.LN10 * (l1 - l0) / W;
+  const rows = [];
+  let i = i0, last = -Infinity, lvMin = top, lvMax = 0;
+  while (i <= i1) {
+    const bpp = (meta.f0 + meta.df * i) * span / meta.df;
+    const level = Math.max(0, Math.min(top, Math.floor(Math.log2(bpp))));
+    lvMin = Math.min(lvMin, level); lvMax = Math.max(lvMax, level);
+    // first bin where the next level up takes over
+    let iEnd = i1;
+    if (level < top) {
+      const fNext = 2 ** (level + 1) * meta.df / span;
+      iEnd = Math.min(i1, Math.max(i, Math.ceil((fNext - meta.f0) / meta.df) - 1));
+    }
+    const s = 2 ** level, b0 = Math.floor(i / s), b1 = Math.floor(iEnd / s);
+    const lastTile = meta.levels[level].tiles - 1;
+    for (let t = Math.floor(b0 / meta.tile_size);
+         t <= Math.min(Math.floor(b1 / meta.tile_size), lastTile); t++) {
+      const a = tile(level, t);
+      if (!a) continue;
+      for (let j = 0; j < a.length; j += 3) {
+        // select by bucket index: the float32 freq column can round the
+        // first bin just below the view edge
+        const b = t * meta.tile_size + j / 3;
+        if (b < b0 || b > b1 || a[j] <= last) continue;
+        rows.push([a[j], a[j + 1], a[j + 2]]);
+        last = a[j];
+      }
+    }
+    i = (b1 + 1) * s;
+  }
+  const logy = document.getElementById("logy").checked;
+  const yv = v => logy ? Math.log10(Math.max(v, 1e-12)) : v;
+  let ymin = logy ? Infinity : 0, ymax = -Infinity;
+  for (const r of rows) { ymax = Math.max(ymax, yv(r[2]));
+                          if (logy) ymin = Math.min(ymin, yv(r[1])); }
+  if (!isFinite(ymax)) ymax = 1;
+  if (!isFinite(ymin) || ymin >= ymax) ymin = ymax - 1;
+  const X = f => (Math.log10(f) - l0) / (l1 - l0) * W;
+  const Y = v => H - 20 - (yv(v) - ymin) / (ymax - ymin) * (H - 40);
+
+  ctx.strokeStyle = "#bbb"; ctx.fillStyle = "#888"; ctx.setLineDash([4, 4]);
+  for (const [label, p] of Object.entries(meta.known_periods)) {
+    const x = X(1 / p);
+    if (x < 0 || x > W) continue;
+    ctx.beginPath(); ctx.moveTo(x, 0); ctx.lineTo(x, H); ctx.stroke();
+    ctx.fillText(label, x + 3, 12);
+  }
+  // one polyline through the buckets; a merged bucket adds its min/max bar
+  ctx.setLineDash([]); ctx.strokeStyle = "#1f77b4"; ctx.beginPath();
+  rows.forEach(([f, lo, hi], k) => {
+    const x = X(f);
+    if (k === 0) ctx.moveTo(x, Y(hi)); else ctx.lineTo(x, Y(hi));
+    if (lo !== hi) ctx.lineTo(x, Y(lo));
+  });
+  ctx.stroke();
+  const levels = lvMin >= lvMax ? `${lvMax}` : `${lvMin}-${lvMax}`;
+  info.textContent = `${meta.ticker}  periods ${(1 / f1).toFixed(1)}`
+    + `-${(1 / f0).toFixed(1)} ${meta.unit}  level ${levels}  ${rows.length} buckets`;
+}
+cv.addEventListener("wheel", e => {
+  e.preventDefault();
+  const [l0, l1] = view, at = l0 + e.offsetX / cv.width * (l1 - l0);
+  const k = e.deltaY > 0 ? 1.25 : 0.8;
+  view = [at - (at - l0) * k, at + (l1 - at) * k];
+  draw();
+});
+cv.addEventListener("mousedown", e => { dragX = e.offsetX; });
+window.addEventListener("mouseup", () => { dragX = null; });
+cv.addEventListener("mousemove", e => {
+  if (dragX === null) return;
+  const d = (dragX - e.offsetX) / cv.width * (view[1] - view[0]);
+  view = [view[0] + d, view[1] + d]; dragX = e.offsetX; draw();
+});
+window.addEventListener("resize", draw);
+document.getElementById("logy").onchange = draw;
+document.getElementById("reset").onclick = resetView;
+const sel = document.getElementById("ticker");
+sel.onchange = () => loadTicker(sel.value);
+fetch("index.json").then(r => r.json()).then(idx => {
+  for (const t of idx.tickers) sel.add(new Option(t, t));
+  if (idx.tickers.length) loadTicker(idx.tickers[0]);
+});
+</script></body></html>
+"""
+
+
+class TileHandler(http.server.SimpleHTTPRequestHandler):
+    def do_GET(self):
+        if self.path in ("/", "/index.html"):
+            body = VIEWER_HTML.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        super().do_GET()
+
+    def end_headers(self):
+        if self.path.endswith(".bin"):
+            self.send_header("Cache-Control", "max-age=3600")
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(out_dir, host="127.0.0.1", port=8050):
+    handler = partial(TileHandler, directory=out_dir)
+    with http.server.ThreadingHTTPServer((host, port), handler) as httpd:
+        print(f"Serving {out_dir} on http://{host}:{port}/")
+        httpd.serve_forever()
+
+
+def build(tickers, out_dir, start_date, end_date, cutoff=0.5, data_dir=None):
+    # business-day series, as in PRISM_5dWeek_BusinessDaysOnly
+    from PRISM_5dWeek_BusinessDaysOnly import fetch_volume, KNOWN_PERIODS
+
+    os.makedirs(out_dir, exist_ok=True)
+    buffers = LeanBuffers()
+    for ticker in tickers:
+        volume = fetch_volume(ticker, start_date, end_date, data_dir=data_dir)
+        freq, power = full_spectrum(volume.to_numpy(), cutoff, buffers=buffers)
+        meta = write_tiles(out_dir, ticker, freq, power,
+                           unit="business days", known_periods=KNOWN_PERIODS,
+                           extra_meta={"start": start_date, "end": end_date})
+        print(f"{ticker}: {meta['bins']} bins, {len(meta['levels'])} levels")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Spectrum tile cache / viewer")
+    parser.add_argument("--dir", default="output/tiles",
+                        help="Tile cache directory")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    b = sub.add_parser("build", help="Compute spectra and write tiles")
+    b.add_argument("--tickers", nargs="+", default=["AMZN"],
+                   help="Ticker symbols to fetch (e.g. AMZN AAPL)")
+    b.add_argument("--start", default="2014-01-01")
+    b.add_argument("--end", default="2024-12-31")
+    b.add_argument("--data", metavar="DIR",
+                   help="read daily volume from a local CSV tree instead")
+
+    s = sub.add_parser("serve", help="Serve the local viewer")
+    s.add_argument("--host", default="127.0.0.1")
+    s.add_argument("--port", type=int, default=8050)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.cmd == "build":
+        build([t.upper() for t in args.tickers], args.dir,
+              args.start, args.end, data_dir=args.data)
+    else:
+        serve(args.dir, args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
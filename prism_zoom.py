@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+# Zoom spectrum for the PRISM scripts.
+#
+# The main FFT only resolves periods to bin spacing (1/N cycles per sample),
+# which at long periods is several days wide. Instead of zero-padding the
+# whole series, evaluate the spectrum densely inside the period bands we
+# care about with a chirp-z transform (scipy.signal.zoom_fft), or at a few
+# exact target periods with Goertzel. Amplitudes are on the same scale as
+# np.abs(np.fft.fft(x)).
+
+import numpy as np
+import matplotlib.pyplot as plt
+from scipy.signal import zoom_fft, lfilter
+
+
+def parse_band(text):
+    # "40:50" -> (40.0, 50.0), for argparse type=
+    lo, hi = (float(v) for v in text.split(":"))
+    if not 0 < lo < hi:
+        raise ValueError(f"Expected MIN:MAX with 0 < MIN < MAX, got {text!r}")
+    return lo, hi
+
+
+def parse_periods(text):
+    # "44,45.6,46" -> [44.0, 45.6, 46.0]
+    return [float(v) for v in text.split(",") if v.strip()]
+
+
+def band_spectrum(x, period_min, period_max, m=512):
+    # m evenly spaced frequencies from 1/period_max to 1/period_min
+    # (periods in samples)
+    x = np.asarray(x)
+    f1, f2 = 1.0 / period_max, 1.0 / period_min
+    X = zoom_fft(x, [f1, f2], m=m, fs=1.0, endpoint=True)
+    freqs = np.linspace(f1, f2, m)
+    return freqs, np.abs(X)
+
+
+def goertzel(x, periods):
+    # DTFT of x at each target period (in samples, need not be integer)
+    x = np.asarray(x, dtype=float)
+    N = len(x)
+    out = np.empty(len(periods), dtype=complex)
+    for i, period in enumerate(periods):
+        w = 2 * np.pi / period
+        # s[n] = x[n] + 2cos(w) s[n-1] - s[n-2], run in C by lfilter
+        s = lfilter([1.0], [1.0, -2 * np.cos(w), 1.0], x)
+        s1, s2 = s[-1], (s[-2] if N > 1 else 0.0)
+        out[i] = np.exp(-1j * w * (N - 1)) * (s1 - np.exp(-1j * w) * s2)
+    return out
+
+
+def refine_periods(x, periods, m=64):
+    # re-locate coarse FFT peaks (periods in samples) to within 1/m of a
+    # bin by zooming over +-1 bin around each one
+    N = len(x)
+    refined = np.empty(len(periods))
+    for i, period in enumerate(periods):
+        f0 = 1.0 / period
+        lo, hi = max(f0 - 1.0 / N, 0.5 / N), min(f0 + 1.0 / N, 0.5)
+        freqs, power = band_spectrum(x, 1.0 / hi, 1.0 / lo, m=m)
+        refined[i] = 1.0 / freqs[np.argmax(power)]
+    return refined
+
+
+def plot_zoom_bands(x, bands, known_periods=None, period_scale=1.0,
+                    m=512, unit="d"):
+    # one panel per (period_min, period_max) band, bands given in the same
+    # unit as the caller's periods (period_scale converts samples -> unit)
+    fig, axes = plt.subplots(len(bands), 1, figsize=(12, 3.5 * len(bands)),
+                             squeeze=False)
+    for ax, (pmin, pmax) in zip(axes[:, 0], bands):
+        freqs, power = band_spectrum(x, pmin / period_scale,
+                                     pmax / period_scale, m=m)
+        periods = period_scale / freqs
+        ax.plot(periods, power, lw=1)
+
+        best = np.argmax(power)
+        ax.scatter(periods[best], power[best], color="red", s=20, zorder=5)
+        ax.annotate(f"{periods[best]:.2f}{unit}",
+                    (periods[best], power[best]),
+                    xytext=(0, 5), textcoords="offset points",
+                    ha="center", va="bottom", fontsize=8)
+        print(f"Zoom {pmin:g}-{pmax:g}{unit}: strongest period "
+              f"{periods[best]:.2f}{unit} (amplitude {power[best]:.3g})")
+
+        for label, days in (known_periods or {}).items():
+            if pmin <= days <= pmax:
+                ax.axvline(days, color='gray', linestyle='--', alpha=0.6)
+                ax.text(days, 0.95, label, rotation=90, va='top', ha='right',
+                        fontsize=9, color='gray',
+                        transform=ax.get_xaxis_transform())
+
+        ax.set_xlim(pmin, pmax)
+        ax.set_xlabel(f"Period ({unit}), chirp-z zoom, {m} points")
+        ax.set_ylabel("Amplitude")
+        ax.grid(alpha=0.3, linestyle="--")
+
+    fig.tight_layout()
+    return fig
+
+
+def print_target_periods(x, periods, period_scale=1.0, unit="d"):
+    amps = np.abs(goertzel(x, [p / period_scale for p in periods]))
+    for period, amp in zip(periods, amps):
+        print(f"Goertzel {period:g}{unit}: amplitude {amp:.3g}")
+    return amps